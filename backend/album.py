@@ -1,19 +1,50 @@
 import io
 import logging
-from hashlib import md5
+import os
+import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, cached_property, lru_cache, partial
 from pathlib import Path
-from typing import Literal
+from typing import BinaryIO, Literal
 
-import eyed3  # type: ignore
 import feedparser  # type: ignore
-import requests
-from PIL import Image, ImageDraw, ImageFont
-
-from .constants import CONTROL_BUTTON_MARGINS, PAUSE_ICON, PLAY_ICON, STOP_ICON
-from .streamdeck import StreamDeckController
+from PIL import Image, ImageDraw
+
+from .cache import (
+    cached_key_image,
+    conditional_get,
+    load_http_meta,
+    store_http_meta,
+    url_cache_name,
+    write_atomic,
+)
+from .constants import (
+    ARTWORK_CACHE_SIZE,
+    CACHE_PATH,
+    CONTROL_BUTTON_MARGINS,
+    PAUSE_ICON,
+    PLAY_ICON,
+    STOP_ICON,
+    icon_path,
+    load_icon,
+)
+from .streamdeck import StreamDeckController, load_font
 
 logger = logging.getLogger(__name__)
 
+# Text encodings of ID3v2 text frames, by encoding byte
+ID3_ENCODINGS = ("latin-1", "utf-16", "utf-16-be", "utf-8")
+
+AUDIO_EXTENSIONS = frozenset((".mp3", ".aiff", ".ogg", ".mp4", ".aac", ".m4a", ".flac"))
+NUMBER_PATTERN = re.compile(r"(\d+)")
+# In order of preference for the album art
+ART_EXTENSIONS = (".jpg", ".jpeg", ".png")
+# Album types whose tracks can be skipped through
+SEEKABLE_TYPES = frozenset(("album", "podcast"))
+# Shown around artwork that doesn't fill the key and through transparent parts
+ARTWORK_BACKGROUND = "teal"
+
 
 class Track:
     """Class representing a track with its metadata."""
@@ -34,6 +65,8 @@ class Track:
         self.index = index  # Track index in the album
         self.deck = deck
         self.track_artwork_ref = track_artwork_ref
+        # Whether the track artwork could not be loaded, see scaled_artwork
+        self.artwork_missing = False
 
     def to_dict(self) -> dict:
         """Convert the track to a dictionary representation."""
@@ -49,60 +82,66 @@ class Track:
         """Get the label for the track."""
         return f"{self.index + 1:02d}"
 
-    @property
-    def artwork(self) -> Image.Image:
-        """Get the artwork for the track."""
-        if self.track_artwork_ref:
-            artwork = get_pil_image_from_ref(self.track_artwork_ref)
-            if artwork:
-                return artwork
-        # Fallback to album artwork if track artwork is not available
-        return self.album.artwork
+    @cached_property
+    def scaled_artwork(self) -> Image.Image:
+        """Get the artwork for the track scaled to the Stream Deck key size."""
+        scaled = get_scaled_artwork(self.deck, self.track_artwork_ref)
+        if scaled is None:
+            self.artwork_missing = self.track_artwork_ref is not None
+            # Fallback to album artwork if track artwork is not available
+            return self.album.scaled_artwork
+        return scaled
+
+    @cached_property
+    def artwork_id(self) -> str:
+        """Identify the track artwork in the on-disk key image cache."""
+        return get_artwork_id(self.track_artwork_ref) or self.album.artwork_id
+
+    def render_key_image(
+        self, icon: str | None = None, label: str | None = None
+    ) -> bytes:
+        """Render the track artwork as a key image, reusing a copy from disk."""
+
+        def render() -> tuple[bytes, bool]:
+            key_image = self.deck.encode_image(
+                self.composed_artwork(icon),
+                margins=CONTROL_BUTTON_MARGINS,
+                label=label,
+            )
+            if self.track_artwork_ref is None:
+                return key_image, not self.album.artwork_missing
+            return key_image, not self.artwork_missing
 
-    @property
-    def play_image(self) -> bytes | None:
-        """Get the play image for the track."""
-        return self.deck.convert_image(
-            self.artwork,
+        return cached_key_image(
+            (self.deck.key_image_id, self.artwork_id, icon_id(icon), label), render
+        )
+
+    def composed_artwork(self, icon: str | None) -> Image.Image:
+        """Get the artwork with the label band and an icon, before the label."""
+        if self.track_artwork_ref is None:
+            # Shared by all tracks of the album that use the album artwork
+            return self.album.composed_artwork(icon)
+        return self.deck.compose_image(
+            self.scaled_artwork,
             margins=CONTROL_BUTTON_MARGINS,
-            background="teal",
-            icon=PAUSE_ICON,
-            label=self.label,
+            icon=load_icon(icon) if icon else None,
+            band=True,
         )
 
-    @property
+    @cached_property
+    def play_image(self) -> bytes | None:
+        """Get the play image for the track."""
+        return self.render_key_image(icon=PAUSE_ICON, label=self.label)
+
+    @cached_property
     def stop_image(self) -> bytes | None:
         """Get the stop image for the track."""
-        return self.deck.convert_image(
-            self.artwork,
-            margins=CONTROL_BUTTON_MARGINS,
-            background="teal",
-            icon=PLAY_ICON,
-            label=self.label,
-        )
+        return self.render_key_image(icon=PLAY_ICON, label=self.label)
 
-    @property
+    @cached_property
     def pause_image(self) -> bytes | None:
         """Get the pause image for the track."""
-        return self.deck.convert_image(
-            self.artwork,
-            margins=CONTROL_BUTTON_MARGINS,
-            background="teal",
-            icon=PLAY_ICON,
-            label=self.label,
-        )
-
-    def set_name(self) -> None:
-        """Set the name of the track from ID3 metadata."""
-        try:
-            tagged_file = eyed3.load(self.path)
-            if tagged_file and tagged_file.tag:
-                self.name = tagged_file.tag.title or Path(self.path).stem
-            else:
-                self.name = Path(self.path).stem
-        except Exception as e:
-            logger.error(f"Error reading ID3 metadata for {self.path}: {e}")
-            self.name = Path(self.path).stem
+        return self.render_key_image(icon=PLAY_ICON, label=self.label)
 
 
 class Album:
@@ -121,14 +160,17 @@ class Album:
         self.path = path
         self.artwork_ref = artwork_ref
         self.cached_artwork: bytes | None = None
+        # Whether the album artwork could not be loaded, see scaled_artwork
+        self.artwork_missing = False
+        # Icon name -> artwork with the label band and icon, see composed_artwork
+        self.composed_artworks: dict[str | None, Image.Image] = {}
         self.deck = deck
         self.type = type
+        self.seekable = type in SEEKABLE_TYPES
         self.tracks = tracks or []
         self.current_track: Track | None = None
         if type == "podcast":
             self.get_podcast_tracks_from_feed(path)
-        # Calling artwork_bytes() to cache the artwork
-        self.artwork_bytes  # noqa: B018
 
     def to_dict(self) -> dict:
         return {
@@ -137,54 +179,75 @@ class Album:
             "type": self.type,
         }
 
-    @property
-    def artwork(self) -> Image.Image:
-        """Get the artwork for the track."""
-        image = get_pil_image_from_ref(self.artwork_ref)
-        if image:
-            return image
-        else:
+    @cached_property
+    def scaled_artwork(self) -> Image.Image:
+        """Get the artwork for the album scaled to the Stream Deck key size."""
+        scaled = get_scaled_artwork(self.deck, self.artwork_ref)
+        if scaled is None:
+            self.artwork_missing = self.artwork_ref is not None
             # Fallback to generated artwork if no image is available
-            return generate_album_artwork_from_text(self.name)
+            scaled = self.deck.scale_image(
+                generate_album_artwork_from_text(self.name),
+                margins=CONTROL_BUTTON_MARGINS,
+                background=ARTWORK_BACKGROUND,
+            )
+        return scaled
+
+    def composed_artwork(self, icon: str | None) -> Image.Image:
+        """Get the artwork with the label band and an icon, shared by the tracks."""
+        composed = self.composed_artworks.get(icon)
+        if composed is None:
+            composed = self.deck.compose_image(
+                self.scaled_artwork,
+                margins=CONTROL_BUTTON_MARGINS,
+                icon=load_icon(icon) if icon else None,
+                band=True,
+            )
+            self.composed_artworks[icon] = composed
+        return composed
+
+    @cached_property
+    def artwork_id(self) -> str:
+        """Identify the album artwork in the on-disk key image cache."""
+        return get_artwork_id(self.artwork_ref) or f"generated:{self.name}"
+
+    def render_key_image(
+        self, icon: str | None = None, label: str | None = None
+    ) -> bytes:
+        """Render the album artwork as a key image, reusing a copy from disk."""
+
+        def render() -> tuple[bytes, bool]:
+            key_image = self.deck.finalize_image(
+                self.scaled_artwork,
+                margins=CONTROL_BUTTON_MARGINS,
+                icon=load_icon(icon) if icon else None,
+                label=label,
+            )
+            return key_image, not self.artwork_missing
 
-    @property
+        return cached_key_image(
+            (self.deck.key_image_id, self.artwork_id, icon_id(icon), label), render
+        )
+
+    @cached_property
     def play_image(self) -> bytes | None:
         """Get the play image for the track."""
-        return self.deck.convert_image(
-            self.artwork,
-            margins=CONTROL_BUTTON_MARGINS,
-            background="teal",
-            icon=STOP_ICON,
-        )
+        return self.render_key_image(icon=STOP_ICON)
 
-    @property
+    @cached_property
     def stop_image(self) -> bytes | None:
         """Get the stop image for the track."""
-        return self.deck.convert_image(
-            self.artwork,
-            margins=CONTROL_BUTTON_MARGINS,
-            background="teal",
-            icon=PLAY_ICON,
-        )
+        return self.render_key_image(icon=PLAY_ICON)
 
-    @property
+    @cached_property
     def pause_image(self) -> bytes | None:
         """Get the pause image for the track."""
-        return self.deck.convert_image(
-            self.artwork,
-            margins=CONTROL_BUTTON_MARGINS,
-            background="teal",
-            icon=PLAY_ICON,
-        )
+        return self.render_key_image(icon=PLAY_ICON)
 
     @property
     def artwork_bytes(self) -> bytes:
         if not self.cached_artwork:
-            self.cached_artwork = self.deck.convert_image(
-                self.artwork,
-                margins=CONTROL_BUTTON_MARGINS,
-                background="teal",
-            )
+            self.cached_artwork = self.render_key_image()
         return self.cached_artwork
 
     def reset_current_track(self) -> None:
@@ -238,7 +301,7 @@ class Album:
 
     def get_podcast_tracks_from_feed(self, feed_url: str) -> None:
         """Fetch podcast tracks from a given feed URL."""
-        parsed = feedparser.parse(feed_url)
+        parsed = feedparser.parse(fetch_feed(feed_url))
         self.artwork_ref = parsed.feed.image.href if parsed.feed.image else None  # type: ignore
         if parsed.feed.title:  # type: ignore
             self.name = parsed.feed.title  # type: ignore
@@ -262,72 +325,207 @@ class Album:
         self.reset_current_track()
 
 
-def read_albums_from_path(path: Path, deck: StreamDeckController) -> list[Album]:
-    """Read albums from a given path and return a list of Album objects."""
-    albums: list[Album] = []
+def read_albums_from_path(path: Path, deck: StreamDeckController) -> Iterator[Album]:
+    """Read albums from a given path, yielding each Album as soon as it is read."""
     if not path.exists() or not path.is_dir():
         logger.error(f"Path {path} does not exist or is not a directory.")
-        return albums
-
-    for album_path in path.iterdir():
-        if album_path.is_dir():
-            # Find the first image file (jpg, jpeg, or png) in the album directory for album art
-            album_art_file_name = None
-            for ext in ("*.jpg", "*.jpeg", "*.png", "*.JPG", "*.JPEG", "*.PNG"):
-                found = list(album_path.glob(ext))
-                if found:
-                    album_art_file_name = found[0]
-                    break
-            tracks = sorted(
-                track
-                for ext in (
-                    "*.mp3",
-                    "*.aiff",
-                    "*.ogg",
-                    "*.mp4",
-                    "*.aac",
-                    "*.m4a",
-                    "*.flac",
-                )
-                for track in album_path.glob(ext)
-            )
-            if not tracks:
-                logger.warning(
-                    f"No audio tracks found in album {album_path.name}. Skipping."
-                )
-                continue
-            # Use eyed3 to read metadata of first track for album name and album art
-            # (Assuming you have eyed3 installed and imported)
-            first_track = tracks[0]
-            tagged_file = eyed3.load(first_track)
-            if tagged_file and tagged_file.tag:
-                album_name = tagged_file.tag.album or album_path.name
-            else:
-                album_name = album_path.name
-            # Determine album art: file or generated fallback
-
-            album = Album(
-                name=album_name,
-                path=str(album_path),
-                deck=deck,
-                artwork_ref=str(album_art_file_name) if album_art_file_name else None,
-                type="album",  # Default type, can be changed later
-                tracks=[],
-            )
-            # Create Track objects for each track in the album
-            for index, track_path in enumerate(tracks):
-                track = Track(
-                    path=str(track_path),
-                    album=album,
-                    index=index,
-                    deck=deck,
-                )
-                album.tracks.append(track)
-                album.reset_current_track()
+        return
+
+    # scandir returns the entry types with the listing, no stat per entry
+    with os.scandir(path) as entries:
+        album_paths = [Path(entry.path) for entry in entries if entry.is_dir()]
+    # Reading the ID3 tags is dominated by disk I/O, so scan albums in parallel
+    with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2)) as executor:
+        for album in executor.map(partial(_build_album, deck=deck), album_paths):
+            if album is not None:
+                yield album
+
+
+def _build_album(album_path: Path, deck: StreamDeckController) -> Album | None:
+    """Build an album from a directory, or None if it holds no audio tracks."""
+    # Sort the directory entries into audio tracks and artwork in a single pass
+    tracks: list[os.DirEntry] = []
+    art_files: dict[str, str] = {}
+    with os.scandir(album_path) as entries:
+        for entry in entries:
+            suffix = os.path.splitext(entry.name)[1].lower()
+            if suffix in AUDIO_EXTENSIONS and entry.is_file():
+                tracks.append(entry)
+            elif suffix in ART_EXTENSIONS and entry.is_file():
+                art_files.setdefault(suffix, entry.path)
+    # Natural order, so "Track 2" comes before "Track 10"
+    tracks.sort(key=lambda entry: natural_sort_key(entry.name))
+    # Use the first image file (jpg, jpeg, or png) for album art
+    album_art_file_name = next(
+        (art_files[ext] for ext in ART_EXTENSIONS if ext in art_files), None
+    )
+    if not tracks:
+        logger.warning(f"No audio tracks found in album {album_path.name}. Skipping.")
+        return None
+    # Read the album name from the ID3 tag of the first track
+    album_name = read_id3_album(tracks[0].path) or album_path.name
+    # Determine album art: file or generated fallback
+
+    album = Album(
+        name=album_name,
+        path=str(album_path),
+        deck=deck,
+        artwork_ref=album_art_file_name,
+        type="album",  # Default type, can be changed later
+        tracks=[],
+    )
+    # Create Track objects for each track in the album
+    for index, track_entry in enumerate(tracks):
+        track = Track(
+            path=track_entry.path,
+            album=album,
+            index=index,
+            deck=deck,
+        )
+        album.tracks.append(track)
+    album.reset_current_track()
+
+    return album
+
+
+def natural_sort_key(name: str) -> list[str | int]:
+    """Sort key comparing runs of digits in a name by their numeric value."""
+    # Splitting on a captured group alternates text and digits, starting with
+    # text, so the keys of any two names compare like with like
+    return [
+        int(part) if index % 2 else part.casefold()
+        for index, part in enumerate(NUMBER_PATTERN.split(name))
+    ]
+
 
-            albums.append(album)
+def read_id3_album(path: str) -> str | None:
+    """Read the album name from the ID3 tag of a file.
+
+    Only the frame headers are read until the album frame is found, so
+    embedded artwork and other large frames are skipped over.
+    """
+    try:
+        with open(path, "rb") as f:
+            return _read_id3v2_album(f) or _read_id3v1_album(f)
+    except OSError as e:
+        logger.error(f"Error reading ID3 metadata for {path}: {e}")
+        return None
+
+
+def _read_id3v2_album(f: BinaryIO) -> str | None:
+    """Read the TALB (TAL in ID3v2.2) frame from an ID3v2 tag."""
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return None
+    version, flags = header[3], header[5]
+    if flags & 0x80:
+        # Unsynchronised tags are rare and not worth decoding here
+        return None
+    tag_end = 10 + _syncsafe(header[6:10])
+    if version == 2:
+        id_length, frame_header_length, album_id = 3, 6, b"TAL"
+    else:
+        id_length, frame_header_length, album_id = 4, 10, b"TALB"
+    if version > 2 and flags & 0x40:
+        # Skip the extended header, its size excludes itself in ID3v2.3
+        size = f.read(4)
+        f.seek(_syncsafe(size) - 4 if version == 4 else int.from_bytes(size), 1)
+    while f.tell() + frame_header_length <= tag_end:
+        frame_header = f.read(frame_header_length)
+        frame_id = frame_header[:id_length]
+        if not frame_id.strip(b"\x00"):
+            break  # Reached the padding
+        size = frame_header[id_length : id_length + (3 if version == 2 else 4)]
+        frame_size = _syncsafe(size) if version == 4 else int.from_bytes(size)
+        if frame_id != album_id:
+            f.seek(frame_size, 1)
+            continue
+        body = f.read(frame_size)
+        if not body or body[0] >= len(ID3_ENCODINGS):
+            return None
+        # ID3v2.4 separates multiple values with NUL, use the first one.
+        # Taggers may leave odd-length UTF-16, so don't fail on bad bytes.
+        text = body[1:].decode(ID3_ENCODINGS[body[0]], errors="replace")
+        return text.split("\x00")[0].strip() or None
+    return None
+
+
+def _read_id3v1_album(f: BinaryIO) -> str | None:
+    """Read the album field from an ID3v1 tag at the end of the file."""
+    f.seek(0, os.SEEK_END)
+    if f.tell() < 128:
+        return None
+    f.seek(-128, os.SEEK_END)
+    tag = f.read(128)
+    if tag[:3] != b"TAG":
+        return None
+    return tag[63:93].split(b"\x00")[0].decode("latin-1").strip() or None
+
+
+def _syncsafe(data: bytes) -> int:
+    """Decode an ID3v2 syncsafe integer (7 bits per byte)."""
+    value = 0
+    for byte in data:
+        value = (value << 7) | (byte & 0x7F)
+    return value
 
-    return albums
+
+class _ArtworkUnavailable(Exception):
+    """Raised to keep a failed artwork load out of the lru_cache."""
+
+
+def get_scaled_artwork(
+    deck: StreamDeckController, artwork_ref: str | None
+) -> Image.Image | None:
+    """Get artwork scaled to the key size, shared by all albums and tracks using it.
+
+    Podcast episodes often reuse the feed image and several albums may point
+    to the same file, so the image is only fetched, decoded and scaled once
+    per reference. Failures aren't remembered, so a later call tries again.
+    """
+    try:
+        return _load_scaled_artwork(deck, artwork_ref)
+    except _ArtworkUnavailable:
+        return None
+
+
+@lru_cache(maxsize=128)
+def _load_scaled_artwork(
+    deck: StreamDeckController, artwork_ref: str | None
+) -> Image.Image:
+    """Load and scale artwork, raising if it is unavailable so it isn't cached."""
+    image = get_pil_image_from_ref(artwork_ref)
+    if image is None:
+        raise _ArtworkUnavailable(artwork_ref)
+    return deck.scale_image(
+        image, margins=CONTROL_BUTTON_MARGINS, background=ARTWORK_BACKGROUND
+    )
+
+
+def get_artwork_id(artwork_ref: str | None) -> str | None:
+    """Identify the current content of an artwork reference without decoding it.
+
+    Returns None if there is no artwork to identify.
+    """
+    if not artwork_ref:
+        return None
+    if artwork_ref.startswith("http"):
+        # Revalidate first so a changed cover gets a new id
+        path = fetch_url_artwork(artwork_ref)
+        if path is None:
+            return None
+    else:
+        path = Path(artwork_ref)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return f"{artwork_ref}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def icon_id(icon: str | None) -> str | None:
+    """Identify an icon file in the on-disk key image cache without decoding it."""
+    return get_artwork_id(str(icon_path(icon))) if icon else None
 
 
 def get_pil_image_from_ref(
@@ -341,32 +539,86 @@ def get_pil_image_from_ref(
     return get_pil_image_from_file(artwork_ref)
 
 
-def get_pil_image_from_url(url: str) -> Image.Image | None:
-    """Fetch an image from a URL and return it as a PIL Image."""
-    # Check cache first
-    cache_file_name = md5(url.encode()).hexdigest()
-    cache_path = Path("./cache") / f"{cache_file_name}.png"
-    if cache_path.exists():
+# URLs whose cached artwork was fetched or revalidated by this process
+_fetched_artwork_urls: set[str] = set()
+
+
+def fetch_url_artwork(url: str) -> Path | None:
+    """Fetch artwork from a URL into the cache, at most once per run.
+
+    Returns the path of the cached copy, or None if there is none.
+    """
+    cache_path = CACHE_PATH / f"{url_cache_name(url)}.jpg"
+    cached = cache_path.exists()
+    # Cached images without validators are used as is, the others are
+    # revalidated with a conditional GET
+    if url in _fetched_artwork_urls or (cached and url not in load_http_meta()):
+        return cache_path if cached else None
+    try:
+        response = conditional_get(url, cached=cached)
+    except Exception as e:
+        logger.error(f"Error fetching image from {url}: {e}")
+        # Use a stale copy rather than none, but try again next time
+        return cache_path if cached else None
+    if response is not None:
         try:
-            return Image.open(cache_path)
+            image = Image.open(io.BytesIO(response.content))
+            # Only keys are drawn from the artwork, so shrink it before caching.
+            # thumbnail() also lets JPEGs decode at a reduced scale.
+            image.thumbnail(ARTWORK_CACHE_SIZE, Image.Resampling.LANCZOS)
+            # JPEG has no alpha, flatten transparent covers onto the key
+            # background like local artwork instead of onto black
+            if image.has_transparency_data:
+                image = image.convert("RGBA")
+                flattened = Image.new("RGB", image.size, ARTWORK_BACKGROUND)
+                flattened.paste(image, mask=image.getchannel("A"))
+                image = flattened
+            # Artwork is lossy at the source and shown at key size, so a JPEG
+            # is much faster to write and to read back than a PNG
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, format="JPEG", quality=85)
+            write_atomic(cache_path, buffer.getvalue())
+            store_http_meta(url, response)
+            logger.info(f"Image fetched and cached: {cache_path}")
         except Exception as e:
-            logger.error(f"Error opening cached image {cache_path}: {e}")
-            cache_path.unlink()
+            logger.error(f"Error fetching image from {url}: {e}")
+            return cache_path if cached else None
+    _fetched_artwork_urls.add(url)
+    return cache_path
+
+
+def get_pil_image_from_url(url: str) -> Image.Image | None:
+    """Fetch an image from a URL and return it as a PIL Image."""
+    cache_path = fetch_url_artwork(url)
+    if cache_path is None:
+        return None
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        image = Image.open(io.BytesIO(response.content))
-        # Save to cache
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        image.save(cache_path, format="PNG")
-        logger.info(f"Image fetched and cached: {cache_path}")
-        # Return the image
-        return image
+        return Image.open(cache_path)
     except Exception as e:
-        logger.error(f"Error fetching image from {url}: {e}")
+        logger.error(f"Error opening cached image {cache_path}: {e}")
+        cache_path.unlink(missing_ok=True)
+        _fetched_artwork_urls.discard(url)
         return None
 
 
+def fetch_feed(feed_url: str) -> bytes:
+    """Fetch a podcast feed, reusing the cached copy if it has not changed."""
+    cache_file_name = url_cache_name(feed_url)
+    cache_path = CACHE_PATH / f"{cache_file_name}.xml"
+    try:
+        response = conditional_get(feed_url, cached=cache_path.exists())
+    except Exception as e:
+        logger.error(f"Error fetching feed {feed_url}: {e}")
+        if not cache_path.exists():
+            return b""
+        response = None
+    if response is None:
+        return cache_path.read_bytes()
+    write_atomic(cache_path, response.content)
+    store_http_meta(feed_url, response)
+    return response.content
+
+
 def get_pil_image_from_file(file_path: str) -> Image.Image | None:
     """Load a PIL Image from a file path."""
     try:
@@ -376,20 +628,22 @@ def get_pil_image_from_file(file_path: str) -> Image.Image | None:
         return None
 
 
+@cache
+def blank_artwork(size: tuple[int, int]) -> Image.Image:
+    """Get the blank canvas for generated album artwork, do not draw on it."""
+    return Image.new("RGB", size, color="gray")
+
+
 def generate_album_artwork_from_text(
     text: str, size: tuple[int, int] = (300, 300)
 ) -> Image.Image:
     """Generate album artwork from text."""
-    # Create a blank image
-    album_art_image = Image.new("RGB", size, color="gray")
+    # The text is drawn onto the canvas, so it still has to be copied, the
+    # copy only saves filling it with the background colour
+    album_art_image = blank_artwork(size).copy()
     draw = ImageDraw.Draw(album_art_image)
     # Load a suitable font for drawing text
-    try:
-        font: ImageFont.ImageFont | ImageFont.FreeTypeFont = ImageFont.truetype(
-            str(Path(__file__).parent / "fonts" / "Roboto_Condensed-Bold.ttf"), 24
-        )
-    except Exception:
-        font = ImageFont.load_default()
+    font = load_font(24)
     # Compute text size using textbbox for proper centering
     bbox = draw.textbbox((0, 0), text, font=font)
     w = bbox[2] - bbox[0]
@@ -1,6 +1,4 @@
-import json
-
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from .controller import get_app_controller
 
@@ -15,7 +13,9 @@ def list_albums():
     """List all albums in the music library."""
     if app_controller is None:
         raise RuntimeError("AppController is not initialized.")
-    return [album.to_dict() for album in app_controller.albums]
+    return Response(
+        content=app_controller.get_albums_payload(), media_type="application/json"
+    )
 
 
 @router.get("/api/status")
@@ -68,7 +68,7 @@ def resume_playback():
     if app_controller is None:
         raise RuntimeError("AppController is not initialized.")
     app_controller.resume_media()
-    return json.dumps({"status": "success", "message": "Playback resumed."})
+    return {"status": "success", "message": "Playback resumed."}
 
 
 @router.post("/api/previous_track")
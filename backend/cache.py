@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from functools import cache
+from hashlib import blake2b
+from pathlib import Path
+
+import requests
+
+from .constants import CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+HTTP_META_PATH = CACHE_PATH / "http_meta.json"
+KEY_IMAGE_CACHE_PATH = CACHE_PATH / "keys"
+# Bump when the key image rendering changes to ignore older cache entries
+KEY_IMAGE_CACHE_VERSION = 1
+# Entries of replaced artwork are never read again, so the cache is pruned
+KEY_IMAGE_CACHE_MAX_SIZE = 100 * 1024 * 1024
+
+_http_meta_lock = threading.Lock()
+
+# Shared so podcast feeds and covers on the same host reuse their connections
+session = requests.Session()
+session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=20))
+session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=20))
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a cache file so that readers never see it half written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per thread, as several threads may fill the same entry
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def url_cache_name(url: str) -> str:
+    """Get the file name under which the body of a URL is cached."""
+    # Only used as a file name, BLAKE2 is faster than MD5 and in the stdlib
+    return blake2b(url.encode(), digest_size=16).hexdigest()
+
+
+@cache
+def load_http_meta() -> dict[str, dict[str, str]]:
+    """Load the validators (ETag, Last-Modified) of previously fetched URLs."""
+    try:
+        return json.loads(HTTP_META_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error(f"Error reading HTTP cache metadata {HTTP_META_PATH}: {e}")
+        return {}
+
+
+def store_http_meta(url: str, response: requests.Response) -> None:
+    """Remember the validators of a response so the URL can be revalidated."""
+    validators = {
+        key: response.headers[header]
+        for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+        if header in response.headers
+    }
+    with _http_meta_lock:
+        http_meta = load_http_meta()
+        if not validators and url not in http_meta:
+            return
+        http_meta[url] = validators
+        write_atomic(HTTP_META_PATH, json.dumps(http_meta).encode())
+
+
+def conditional_get(url: str, cached: bool) -> requests.Response | None:
+    """GET a URL, revalidating the cached copy if there is one.
+
+    Returns None if the server reports the cached copy is still current.
+    """
+    headers = {}
+    validators = load_http_meta().get(url, {}) if cached else {}
+    if "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if "last_modified" in validators:
+        headers["If-Modified-Since"] = validators["last_modified"]
+    response = session.get(url, timeout=10, headers=headers)
+    if response.status_code == 304:
+        logger.debug(f"Cached copy of {url} is still current")
+        return None
+    response.raise_for_status()
+    return response
+
+
+def cached_key_image(key: tuple, render: Callable[[], tuple[bytes, bool]]) -> bytes:
+    """Get a rendered key image from the disk cache, or render and store it.
+
+    render returns the key image and whether to store it, fallback images
+    rendered because the artwork could not be loaded are not stored.
+    """
+    name = blake2b(repr((KEY_IMAGE_CACHE_VERSION, key)).encode(), digest_size=16)
+    path = KEY_IMAGE_CACHE_PATH / f"{name.hexdigest()}.bin"
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"Error reading cached key image {path}: {e}")
+    key_image, store = render()
+    if not store:
+        return key_image
+    try:
+        write_atomic(path, key_image)
+    except OSError as e:
+        logger.error(f"Error caching key image {path}: {e}")
+    return key_image
+
+
+def prune_key_image_cache() -> None:
+    """Delete the least recently used key images above the cache size cap."""
+    entries = []
+    for path in KEY_IMAGE_CACHE_PATH.glob("*.bin"):
+        try:
+            entries.append((path, path.stat()))
+        except OSError:
+            continue
+    total = sum(stat.st_size for _, stat in entries)
+    if total <= KEY_IMAGE_CACHE_MAX_SIZE:
+        return
+    # Access times may not be updated on reads (noatime, relatime)
+    entries.sort(key=lambda entry: max(entry[1].st_atime, entry[1].st_mtime))
+    for path, stat in entries:
+        if total <= KEY_IMAGE_CACHE_MAX_SIZE:
+            break
+        try:
+            path.unlink()
+        except OSError as e:
+            logger.error(f"Error pruning cached key image {path}: {e}")
+            continue
+        total -= stat.st_size
+    logger.info(f"Pruned key image cache to {total} bytes")
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 from PIL import Image
@@ -6,7 +7,23 @@ CONTROL_BUTTON_MARGINS = (5, 5, 5, 5)  # Margins for control buttons
 CAROUSEL_RESET_TIMEOUT = 30  # seconds
 CAROUSEL_REPEAT_INTERVAL = 0.2  # seconds
 MUSIC_PATH = Path.home() / "Music"  # Default music directory
+CACHE_PATH = Path("./cache")  # Downloaded artwork and feeds
+ARTWORK_CACHE_SIZE = (256, 256)  # Bounding box for cached artwork
 
-PAUSE_ICON = Image.open("./icons/pause-solid.png")
-PLAY_ICON = Image.open("./icons/play-solid.png")
-STOP_ICON = Image.open("./icons/stop-solid.png")
+ICONS_PATH = Path("./icons")
+
+# Overlay icons, by name
+PAUSE_ICON = "pause"
+PLAY_ICON = "play"
+STOP_ICON = "stop"
+
+
+def icon_path(name: str) -> Path:
+    """Get the path of an overlay icon."""
+    return ICONS_PATH / f"{name}-solid.png"
+
+
+@cache
+def load_icon(name: str) -> Image.Image:
+    """Load an overlay icon, decoding it only when it is first drawn."""
+    return Image.open(icon_path(name)).convert("RGBA")
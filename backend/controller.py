@@ -1,29 +1,65 @@
 import json
 import logging
+import os
+import queue
 import threading
-from time import sleep
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from time import monotonic, sleep
 
 from PIL import Image
 
-from .album import Album, read_albums_from_path
+from .album import Album, get_artwork_id, read_albums_from_path
+from .cache import cached_key_image, prune_key_image_cache
 from .constants import (
     CAROUSEL_REPEAT_INTERVAL,
     CAROUSEL_RESET_TIMEOUT,
     CONTROL_BUTTON_MARGINS,
     MUSIC_PATH,
 )
-from .player import VLCPlayer
+from .player import PLAYING_STATES, PlayerState, VLCPlayer
 from .streamdeck import StreamDeckController
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Control button name -> (icon path, background colour)
+CONTROL_ICONS: dict[str, tuple[str, str]] = {
+    "next": ("./icons/circle-arrow-right-solid.png", "teal"),
+    "previous": ("./icons/circle-arrow-left-solid.png", "teal"),
+    "next_track": ("./icons/angles-right-solid.png", "teal"),
+    "previous_track": ("./icons/angles-left-solid.png", "teal"),
+    "now_playing_empty": ("./icons/music-solid.png", "gray"),
+}
+
+
+@lru_cache(maxsize=64)
+def load_control_image(
+    deck: StreamDeckController,
+    path: str,
+    margins: tuple[int, int, int, int],
+    background: str,
+) -> bytes:
+    """Load an icon from disk and convert it to Stream Deck key bytes once."""
+
+    def render() -> tuple[bytes, bool]:
+        # Close the icon right away rather than leaving its decoder to the GC
+        with Image.open(path) as image:
+            key_image = deck.convert_image(
+                image, margins=margins, background=background
+            )
+        return key_image, True
+
+    return cached_key_image(
+        (deck.key_image_id, get_artwork_id(path), margins, background), render
+    )
+
 
 def start_carousel_decorator(func):
     """Decorator to start the carousel reset timer."""
 
     def wrapper(self, *args, **kwargs):
-        self._cancel_carousel_timer()
         result = func(self, *args, **kwargs)
         self._start_carousel_timer()
         return result
@@ -35,55 +71,61 @@ class AppController:
     def __init__(self) -> None:
         self.albums: list[Album] = []
         self.deck_controller = StreamDeckController()
+        # Handlers of player events, run in order by a single background thread
+        # so libvlc's event thread only has to enqueue them
+        self._event_queue: queue.SimpleQueue[Callable[[], None]] = queue.SimpleQueue()
+        threading.Thread(target=self._event_thread, daemon=True).start()
         self.player = VLCPlayer(
-            on_playback_end=lambda event: threading.Thread(
-                target=self.on_playback_end, daemon=True
-            ).start()
+            on_playback_end=lambda event: self._event_queue.put(self.on_playback_end),
+            on_state_change=lambda event: self._event_queue.put(
+                self.setup_now_playing_button
+            ),
         )
         self.album_count = 0
+        # (album count, JSON body) of /api/albums, see get_albums_payload
+        self._albums_payload: tuple[int, bytes] | None = None
         self.current_carousel_start_index = 0
         self.current_playing_album: Album | None = None
-
-        # Timer for carousel reset
-        self.carousel_timer: threading.Timer | None = None
-        self.carousel_timer_lock = threading.Lock()
-
-        self.control_images = {
-            "next": self.deck_controller.convert_image(
-                Image.open("./icons/circle-arrow-right-solid.png"),
-                margins=CONTROL_BUTTON_MARGINS,
-                background="teal",
-            ),
-            "previous": self.deck_controller.convert_image(
-                Image.open("./icons/circle-arrow-left-solid.png"),
-                margins=CONTROL_BUTTON_MARGINS,
-                background="teal",
-            ),
-            "next_track": self.deck_controller.convert_image(
-                Image.open("./icons/angles-right-solid.png"),
-                margins=CONTROL_BUTTON_MARGINS,
-                background="teal",
-            ),
-            "previous_track": self.deck_controller.convert_image(
-                Image.open("./icons/angles-left-solid.png"),
-                margins=CONTROL_BUTTON_MARGINS,
-                background="teal",
-            ),
-            "now_playing_empty": self.deck_controller.convert_image(
-                Image.open("./icons/music-solid.png"),
-                margins=CONTROL_BUTTON_MARGINS,
-                background="gray",
-            ),
+        # Whether the control buttons currently show track or carousel controls
+        self._track_controls_shown: bool | None = None
+        # Albums currently shown on the media buttons, by key index
+        self._media_button_albums: list[Album] = []
+
+        # Deadline for carousel reset, watched by a single background thread
+        self.carousel_deadline: float | None = None
+        self.carousel_wake = threading.Event()
+        threading.Thread(target=self._carousel_reset_thread, daemon=True).start()
+
+        # Workers rendering album artwork ahead of it becoming visible
+        self.artwork_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        self.artwork_executor.submit(prune_key_image_cache)
+
+        # Render the control icons while the configuration is read, they are
+        # submitted first so they aren't queued behind the album artwork
+        control_image_futures = {
+            name: self.artwork_executor.submit(
+                load_control_image,
+                self.deck_controller,
+                path,
+                CONTROL_BUTTON_MARGINS,
+                background,
+            )
+            for name, (path, background) in CONTROL_ICONS.items()
         }
         self.read_config()
-        self.setup_media_buttons()
-        self.setup_control_buttons()
-        self.setup_now_playing_button()
+        self.control_images = {
+            name: future.result() for name, future in control_image_futures.items()
+        }
+        with self.deck_controller.batch():
+            self.setup_media_buttons()
+            self.setup_control_buttons()
+            self.setup_now_playing_button()
         # self.periodically_scan_for_new_albums(60)  # Scan every 60 seconds
         logger.info("Application initialized successfully.")
 
     def cleanup(self) -> None:
         logger.info("Cleaning up application resources...")
+        self.artwork_executor.shutdown(wait=False, cancel_futures=True)
         if self.deck_controller:
             self.deck_controller.close()
         if self.player:
@@ -106,36 +148,73 @@ class AppController:
                 name, path, self.deck_controller, album_art, tracks=tracks, type=type
             )
             self.albums.append(album)
+            self.prepare_artwork(album)
 
-        # Load albums in music path
-        albums = read_albums_from_path(MUSIC_PATH, self.deck_controller)
-        self.albums.extend(albums)
+        # Load albums in music path, their artwork renders while the scan goes on
+        for album in read_albums_from_path(MUSIC_PATH, self.deck_controller):
+            self.albums.append(album)
+            self.prepare_artwork(album)
 
         self.album_count = len(self.albums)
 
         logger.info(f"Loaded {self.album_count} albums from music path.")
 
+    def get_albums_payload(self) -> bytes:
+        """Get the album list as a JSON body, serialized once per library change."""
+        # Albums are only ever added, so the count tells whether it is stale
+        payload = self._albums_payload
+        album_count = len(self.albums)
+        if payload is None or payload[0] != album_count:
+            albums = [album.to_dict() for album in self.albums[:album_count]]
+            payload = (
+                album_count,
+                json.dumps(albums, ensure_ascii=False, separators=(",", ":")).encode(),
+            )
+            self._albums_payload = payload
+        return payload[1]
+
+    def prepare_artwork(self, album: Album) -> None:
+        """Render the artwork of an album in the background.
+
+        This way the carousel only waits for images that are not ready yet.
+        Pillow releases the GIL while resizing and encoding.
+        """
+        self.artwork_executor.submit(lambda: album.artwork_bytes)
+
     def setup_media_buttons(self) -> None:
         logger.info("Setting up media buttons...")
-        # inside setup_media_buttons
-        for idx, album in enumerate(
-            wrap_slice(self.albums, self.current_carousel_start_index, 3)
-        ):
-            self.deck_controller.set_button(
-                idx,
-                image=album.artwork_bytes,
-                action=lambda a=album: self.play_media(a),
-            )
+        albums = wrap_slice(self.albums, self.current_carousel_start_index, 3)
+        # Render the images of the keys whose album changed first, then upload
+        # them in one batch
+        self.deck_controller.set_buttons(
+            {
+                idx: {
+                    "image": album.artwork_bytes,
+                    "action": partial(self.play_media, album),
+                }
+                for idx, album in enumerate(albums)
+                if idx >= len(self._media_button_albums)
+                or album is not self._media_button_albums[idx]
+            }
+        )
+        self._media_button_albums = albums
 
         logger.info("Media buttons setup completed.")
 
-    def setup_control_buttons(self) -> None:
+    def setup_control_buttons(self, state: PlayerState | None = None) -> None:
         """Set up control buttons for the Stream Deck."""
-        if (
+        if state is None:
+            state = self.player.state
+        track_controls = bool(
             self.current_playing_album
-            and self.current_playing_album.type in ["album", "podcast"]
-            and self.player.is_playing
-        ):
+            and self.current_playing_album.seekable
+            and state in PLAYING_STATES
+        )
+        if track_controls == self._track_controls_shown:
+            # The buttons already show the right controls, skip the USB writes
+            return
+        self._track_controls_shown = track_controls
+        if track_controls:
             # If the current playing album is an album and is playing, set up next/previous track buttons
             self.deck_controller.set_button(
                 4,
@@ -164,7 +243,7 @@ class AppController:
                 long_press_action=(self.carousel_next, CAROUSEL_REPEAT_INTERVAL),
             )
 
-    def setup_now_playing_button(self) -> None:
+    def setup_now_playing_button(self, state: PlayerState | None = None) -> None:
         """Set up the 'Now Playing' button."""
         if self.current_playing_album is None:
             self.deck_controller.set_button(
@@ -174,30 +253,32 @@ class AppController:
             )
             return
         album = self.current_playing_album
+        if state is None:
+            state = self.player.state
         artwork_image: bytes | None = self.control_images["now_playing_empty"]
-        if self.player.is_playing:
+        if state in PLAYING_STATES:
             # If the player is playing, use the album artwork
             artwork_image = album.get_play_image()
-        elif self.player.is_paused:
+        elif state == PlayerState.PAUSED:
             # If the player is paused, use the album artwork with a different icon
             artwork_image = album.get_pause_image()
-        elif self.player.is_stopped:
+        elif state == PlayerState.STOPPED:
             # If the player is stopped, use the album artwork with a different icon
             artwork_image = album.get_stop_image()
 
         self.deck_controller.set_button(
             3,
             image=artwork_image,
-            action=lambda a=album: self.play_pause_media(a),
+            action=partial(self.play_pause_media, album),
             long_press_action=self.stop_media,
         )
 
     @start_carousel_decorator
     def carousel_next(self) -> None:
         """Move to the next carousel page."""
-        self.current_carousel_start_index = self.current_carousel_start_index + 1
-        if self.current_carousel_start_index >= self.album_count:
-            self.current_carousel_start_index = 0
+        self.current_carousel_start_index = (
+            self.current_carousel_start_index + 1
+        ) % max(self.album_count, 1)
 
         logger.info(
             f"Current carousel start index: {self.current_carousel_start_index}"
@@ -207,9 +288,9 @@ class AppController:
     @start_carousel_decorator
     def carousel_previous(self) -> None:
         """Move to the previous carousel page."""
-        self.current_carousel_start_index = self.current_carousel_start_index - 1
-        if self.current_carousel_start_index < 0:
-            self.current_carousel_start_index = self.album_count - 1
+        self.current_carousel_start_index = (
+            self.current_carousel_start_index - 1
+        ) % max(self.album_count, 1)
         logger.info(
             f"Current carousel start index: {self.current_carousel_start_index}"
         )
@@ -218,10 +299,7 @@ class AppController:
     @start_carousel_decorator
     def play_next_track(self) -> None:
         """Play the next track in the current album."""
-        if self.current_playing_album and self.current_playing_album.type in [
-            "album",
-            "podcast",
-        ]:
+        if self.current_playing_album and self.current_playing_album.seekable:
             self.current_playing_album.next_track()
             self.play_media(self.current_playing_album)
             logger.info(f"Playing next track: {self.current_playing_album.get_path()}")
@@ -231,10 +309,7 @@ class AppController:
     @start_carousel_decorator
     def play_previous_track(self) -> None:
         """Play the previous track in the current album."""
-        if self.current_playing_album and self.current_playing_album.type in [
-            "album",
-            "podcast",
-        ]:
+        if self.current_playing_album and self.current_playing_album.seekable:
             self.current_playing_album.previous_track()
             self.play_media(self.current_playing_album)
             logger.info(
@@ -255,8 +330,14 @@ class AppController:
         success = self.player.play(album.get_path())
         if success:
             self.current_playing_album = album
-            self.setup_now_playing_button()
-            self.setup_control_buttons()
+            state = self.player.state
+            with self.deck_controller.batch():
+                self.setup_now_playing_button(state)
+                self.setup_control_buttons(state)
+            # Have the other now playing images ready for a pause or stop
+            self.artwork_executor.submit(
+                lambda: (album.get_pause_image(), album.get_stop_image())
+            )
             logger.info(f"Playing media: {album.name}")
         else:
             logger.error(
@@ -266,10 +347,9 @@ class AppController:
     @start_carousel_decorator
     def pause_media(self) -> None:
         """Pause the currently playing media."""
-        if self.player.is_playing:
+        if self.player.state in PLAYING_STATES:
             self.player.pause()
-            sleep(0.1)
-            self.setup_now_playing_button()
+            # The now playing button is refreshed by on_state_change
             logger.info("Media playback paused.")
         else:
             logger.info("No media is currently playing to pause.")
@@ -277,10 +357,9 @@ class AppController:
     @start_carousel_decorator
     def resume_media(self) -> None:
         """Resume the currently paused media."""
-        if self.player.is_paused and self.current_playing_album:
+        if self.player.state == PlayerState.PAUSED and self.current_playing_album:
             self.player.resume()
-            sleep(0.1)
-            self.setup_now_playing_button()
+            # The now playing button is refreshed by on_state_change
             logger.info("Media playback resumed.")
         else:
             logger.info("No media is currently paused to resume.")
@@ -288,14 +367,15 @@ class AppController:
     @start_carousel_decorator
     def stop_media(self) -> bool:
         """Stop the currently playing media."""
-        if self.player.is_playing or self.player.is_paused:
+        state = self.player.state
+        if state in PLAYING_STATES or state == PlayerState.PAUSED:
             self.player.stop()
             if self.current_playing_album:
                 self.current_playing_album.reset_current_track()
             self.current_playing_album = None
-            sleep(0.1)  # Allow time for the player to stop
-            self.setup_now_playing_button()
-            self.setup_control_buttons()
+            with self.deck_controller.batch():
+                self.setup_now_playing_button(PlayerState.STOPPED)
+                self.setup_control_buttons(PlayerState.STOPPED)
             logger.info("Media playback stopped.")
             return True
         else:
@@ -305,19 +385,30 @@ class AppController:
     @start_carousel_decorator
     def play_pause_media(self, album) -> None:
         """Play or pause media based on current state."""
-        if self.player.is_playing:
+        state = self.player.state
+        if state in PLAYING_STATES:
             self.pause_media()
         else:
-            if self.player.is_paused:
+            if state == PlayerState.PAUSED:
                 self.resume_media()
             else:
                 # If not playing or paused, start playing the album
                 self.current_playing_album = album
-                self.setup_now_playing_button()
-                self.setup_control_buttons()
+                with self.deck_controller.batch():
+                    self.setup_now_playing_button(state)
+                    self.setup_control_buttons(state)
                 logger.info(f"Playing media: {album.name}")
                 self.play_media(album)
 
+    def _event_thread(self) -> None:
+        """Background thread running the handlers of player events."""
+        while True:
+            handler = self._event_queue.get()
+            try:
+                handler()
+            except Exception as e:
+                logger.error(f"Error handling player event: {e}")
+
     def on_playback_end(self) -> None:
         """Handle playback end event."""
         logger.info("Playback ended, handling end of playback.")
@@ -340,26 +431,36 @@ class AppController:
             logger.warning("No current playing album to handle playback end.")
             self.stop_media()
 
-    def _cancel_carousel_timer(self) -> None:
-        """Cancel the current carousel timer if it exists."""
-        with self.carousel_timer_lock:
-            if self.carousel_timer:
-                self.carousel_timer.cancel()
-                self.carousel_timer = None
-
     def _start_carousel_timer(self) -> None:
-        """Start or restart the carousel reset timer."""
-        with self.carousel_timer_lock:
-            # Cancel existing timer
-            if self.carousel_timer:
-                self.carousel_timer.cancel()
-
-            # Only start timer if not already at default position
-            if self.current_carousel_start_index != 0:
-                self.carousel_timer = threading.Timer(
-                    CAROUSEL_RESET_TIMEOUT, self._reset_carousel_to_default
-                )
-                self.carousel_timer.start()
+        """Start or restart the carousel reset deadline, replacing any earlier one."""
+        # Only arm the deadline if not already at default position
+        if self.current_carousel_start_index != 0:
+            self.carousel_deadline = monotonic() + CAROUSEL_RESET_TIMEOUT
+        else:
+            self.carousel_deadline = None
+        self.carousel_wake.set()
+
+    def _carousel_reset_thread(self) -> None:
+        """Background thread resetting the carousel once its deadline has passed."""
+        # The deadline is only assigned by _start_carousel_timer, this thread
+        # never clears it and instead remembers which deadline it has acted
+        # on. Each deadline is a new float object, so a deadline set while
+        # the carousel is being reset is never mistaken for the handled one.
+        handled: float | None = None
+        while True:
+            deadline = self.carousel_deadline
+            if deadline is handled:
+                deadline = None
+            timeout = None if deadline is None else max(deadline - monotonic(), 0)
+            if self.carousel_wake.wait(timeout):
+                # The deadline was moved, wait again with the new one
+                self.carousel_wake.clear()
+                continue
+            deadline = self.carousel_deadline
+            if deadline is None or deadline is handled or monotonic() < deadline:
+                continue
+            handled = deadline
+            self._reset_carousel_to_default()
 
     def _reset_carousel_to_default(self) -> None:
         """Reset carousel to default position (index 0)."""
@@ -390,7 +491,7 @@ class AppController:
     def scan_for_new_albums(self) -> None:
         """Scan for new albums and update the album list."""
         logger.info("Scanning for new albums...")
-        new_albums = read_albums_from_path(MUSIC_PATH, self.deck_controller)
+        new_albums = list(read_albums_from_path(MUSIC_PATH, self.deck_controller))
         if new_albums:
             # Check for duplicates before extending the album list
             existing_album_paths = {album.get_path() for album in self.albums}
@@ -403,6 +504,8 @@ class AppController:
                 logger.info("No new albums found.")
                 return
             self.albums.extend(new_albums)
+            for album in new_albums:
+                self.prepare_artwork(album)
             self.album_count = len(self.albums)
             self.setup_media_buttons()
             logger.info(f"Found {len(new_albums)} new albums.")
@@ -424,4 +527,6 @@ def get_app_controller() -> AppController:
 def wrap_slice(lst: list, x: int, y: int) -> list:
     """Return y elements from lst starting at x, wrapping around."""
     n = len(lst)
+    if n == 0:
+        return []
     return [lst[(x + i) % n] for i in range(y)]
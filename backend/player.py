@@ -9,11 +9,19 @@ import enum
 import logging
 import threading
 import time
+from collections import OrderedDict
 from collections.abc import Callable
 
 import vlc  # type: ignore
 
 MediaPlayerEndReached = vlc.EventType.MediaPlayerEndReached  # type: ignore
+MediaPlayerEncounteredError = vlc.EventType.MediaPlayerEncounteredError  # type: ignore
+# Events after which the player state visible to the UI has changed
+STATE_CHANGE_EVENTS = (
+    vlc.EventType.MediaPlayerPlaying,  # type: ignore
+    vlc.EventType.MediaPlayerPaused,  # type: ignore
+    vlc.EventType.MediaPlayerStopped,  # type: ignore
+)
 
 
 class PlayerState(enum.Enum):
@@ -26,6 +34,21 @@ class PlayerState(enum.Enum):
     BUFFERING = "buffering"
 
 
+# Player states by libvlc state, anything else counts as stopped
+STATE_MAP = {
+    vlc.State.Playing: PlayerState.PLAYING,  # type: ignore
+    vlc.State.Paused: PlayerState.PAUSED,  # type: ignore
+    vlc.State.Stopped: PlayerState.STOPPED,  # type: ignore
+    vlc.State.Error: PlayerState.ERROR,  # type: ignore
+    vlc.State.Buffering: PlayerState.BUFFERING,  # type: ignore
+    vlc.State.Opening: PlayerState.OPENING,  # type: ignore
+    vlc.State.Ended: PlayerState.ENDED,  # type: ignore
+}
+# States in which the player counts as playing
+PLAYING_STATES = (PlayerState.PLAYING, PlayerState.OPENING)
+# Number of media objects kept for replaying recently played refs
+MEDIA_CACHE_SIZE = 16
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +57,11 @@ class VLCPlayer:
 
     _vlc: vlc.Instance
 
-    def __init__(self, on_playback_end: Callable | None = None) -> None:
+    def __init__(
+        self,
+        on_playback_end: Callable | None = None,
+        on_state_change: Callable | None = None,
+    ) -> None:
         self.volume = 1.0
         self.error_message: str | None = None
 
@@ -43,41 +70,51 @@ class VLCPlayer:
             raise RuntimeError("Failed to create VLC instance")
         self.vlc = _vlc
         self.player = self.vlc.media_player_new()
+        # Recently played media by ref, least recently played first
+        self._media_cache: OrderedDict[str, vlc.Media] = OrderedDict()
+        # Playback is started from the API and from the deck callback threads
+        self._media_cache_lock = threading.Lock()
         if on_playback_end:
             self.player.event_manager().event_attach(
                 MediaPlayerEndReached,
                 on_playback_end,
             )
+        # Set from libvlc's event thread whenever the state changes, so play()
+        # can wait for playback to start instead of sleeping and polling
+        self._state_changed = threading.Event()
+        self._on_state_change = on_state_change
+        for event_type in STATE_CHANGE_EVENTS:
+            self.player.event_manager().event_attach(
+                event_type, self._handle_state_change
+            )
+        self.player.event_manager().event_attach(
+            MediaPlayerEncounteredError, lambda event: self._state_changed.set()
+        )
 
         # Threading
         self._playback_thread: threading.Thread | None = None
         self._stop_flag = threading.Event()
         self.event_manager = self.player.event_manager()
 
+    def _handle_state_change(self, event: vlc.Event) -> None:
+        """Wake up play() and notify the caller when playback starts, pauses or stops.
+
+        Called from libvlc's event thread, so callers don't have to sleep and
+        poll the state.
+        """
+        self._state_changed.set()
+        if self._on_state_change:
+            self._on_state_change(event)
+
     @property
     def state(self) -> PlayerState:
         """Get the current player state"""
-        state = self.player.get_state()
-        if state == vlc.State.Playing:  # type: ignore
-            return PlayerState.PLAYING
-        elif state == vlc.State.Paused:  # type: ignore
-            return PlayerState.PAUSED
-        elif state == vlc.State.Stopped:  # type: ignore
-            return PlayerState.STOPPED
-        elif state == vlc.State.Error:  # type: ignore
-            return PlayerState.ERROR
-        elif state == vlc.State.Buffering:  # type: ignore
-            return PlayerState.BUFFERING
-        elif state == vlc.State.Opening:  # type: ignore
-            return PlayerState.OPENING
-        elif state == vlc.State.Ended:  # type: ignore
-            return PlayerState.ENDED
-        return PlayerState.STOPPED
+        return STATE_MAP.get(self.player.get_state(), PlayerState.STOPPED)
 
     @property
     def is_playing(self) -> bool:
         """Check if the player is currently playing"""
-        return self.state == PlayerState.PLAYING or self.state == PlayerState.OPENING
+        return self.state in PLAYING_STATES
 
     @property
     def is_paused(self) -> bool:
@@ -96,39 +133,60 @@ class VLCPlayer:
             if self.state == PlayerState.PLAYING:
                 self.stop()
             logger.debug(f"Setting media: {media_ref}")
-            media = self.vlc.media_new(media_ref)
+            media = self._get_media(media_ref)
             logger.debug(f"Media set: {media_ref}")
             self.player.set_media(media)
             logger.debug(f"Setting volume: {self.volume * 100}%")
             self.player.audio_set_volume(int(self.volume * 100))
             logger.debug("Starting playback")
             # Start playback
+            self._state_changed.clear()
             self.player.play()
             self.error_message = None
             # Wait for playback to actually start or error/ended, fail after 10 seconds
-            start_time = time.time()
-            while (
-                self.state != PlayerState.PLAYING
-                and self.state != PlayerState.ERROR
-                and self.state != PlayerState.ENDED
+            deadline = time.monotonic() + 10
+            # Fallback poll interval, doubled up to 0.1 seconds while waiting
+            poll_interval = 0.005
+            while (state := self.state) not in (
+                PlayerState.PLAYING,
+                PlayerState.ERROR,
+                PlayerState.ENDED,
             ):
-                time.sleep(0.1)
-                logger.debug(f"Current player state: {self.state}")
-                if time.time() - start_time > 10:
+                logger.debug(f"Current player state: {state}")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     self.error_message = "Playback did not start within 10 seconds."
                     logger.error(self.error_message)
                     return False
+                # Woken by libvlc on playing or error, the timeout only
+                # catches media that ends before it is reported as playing
+                self._state_changed.wait(min(remaining, poll_interval))
+                self._state_changed.clear()
+                poll_interval = min(poll_interval * 2, 0.1)
             # Return True only if truly playing
-            if self.state == PlayerState.PLAYING:
+            if state == PlayerState.PLAYING:
                 return True
             # Playback failed to start
-            self.error_message = f"Playback did not start successfully: {self.state}"
+            self.error_message = f"Playback did not start successfully: {state}"
             return False
 
         except Exception as e:
             self.error_message = f"Playback error: {str(e)}"
             return False
 
+    def _get_media(self, media_ref: str) -> vlc.Media:
+        """Get the media for a ref, reusing it if it was played recently."""
+        with self._media_cache_lock:
+            media = self._media_cache.pop(media_ref, None)
+            if media is None:
+                media = self.vlc.media_new(media_ref)
+            self._media_cache[media_ref] = media
+            if len(self._media_cache) > MEDIA_CACHE_SIZE:
+                # The player keeps its own reference to the media it is playing
+                _, evicted = self._media_cache.popitem(last=False)
+                evicted.release()
+            return media
+
     def stop(self) -> bool:
         """Stop playback"""
         try:
@@ -182,6 +240,10 @@ class VLCPlayer:
         """Clean up VLC resources"""
         try:
             self.stop()
+            with self._media_cache_lock:
+                for media in self._media_cache.values():
+                    media.release()
+                self._media_cache.clear()
             if self.player:
                 self.player.release()
             if self.vlc:
@@ -1,7 +1,12 @@
+import heapq
+import itertools
 import logging
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
@@ -14,36 +19,134 @@ logger = logging.getLogger(__name__)
 
 LONG_PRESS_THRESHOLD = 1.0  # seconds
 FONT_PATH = Path(__file__).parent / "fonts" / "Roboto_Condensed-Bold.ttf"
+# Key image in the deck's native format, PILHelper returns it as a memoryview
+KeyImage = bytes | memoryview
+
+
+@cache
+def load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """Load the label font, parsing the font file only once per size."""
+    if FONT_PATH.exists():
+        return ImageFont.truetype(str(FONT_PATH), size)
+    return ImageFont.load_default(size)
+
+
+@cache
+def label_band(size: tuple[int, int]) -> Image.Image:
+    """Get the mask of the translucent band drawn behind labels and icons."""
+    return Image.new("L", size, 128)
+
+
+class ScheduledCall:
+    """A callback scheduled on KeyTimers, which can be cancelled until it runs."""
+
+    def __init__(self, callback: Callable, args: tuple) -> None:
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Keep the callback from running."""
+        self.cancelled = True
+
+
+class KeyTimers:
+    """Runs the delayed callbacks of all keys on a single background thread."""
+
+    def __init__(self) -> None:
+        # (monotonic time, sequence number, call), the number breaks ties
+        self._heap: list[tuple[float, int, ScheduledCall]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def call_later(self, delay: float, callback: Callable, *args) -> ScheduledCall:
+        """Run a callback after a delay in seconds."""
+        call = ScheduledCall(callback, args)
+        with self._condition:
+            heapq.heappush(
+                self._heap, (time.monotonic() + delay, next(self._sequence), call)
+            )
+            self._condition.notify()
+        return call
+
+    def _run(self) -> None:
+        """Background thread running the callbacks when they are due."""
+        while True:
+            with self._condition:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = (
+                        self._heap[0][0] - time.monotonic() if self._heap else None
+                    )
+                    self._condition.wait(timeout)
+                _, _, call = heapq.heappop(self._heap)
+            if call.cancelled:
+                continue
+            try:
+                call.callback(*call.args)
+            except Exception as e:
+                logger.error(f"Error in scheduled key callback: {e}")
+
+
+@dataclass
+class KeyState:
+    """Callbacks and press tracking of a single key."""
+
+    callback: Callable | None = None
+    long_press_callback: Callable | None = None
+    # (callback, interval in seconds)
+    repeat_long_press_callback: tuple[Callable, float] | None = None
+    long_press_timer: ScheduledCall | None = None
+    # Set on release to end the repeats of the current hold
+    repeat_stop: threading.Event | None = None
+    press_time: float | None = None
+    long_press_triggered: bool = False
 
 
 class StreamDeckController:
     device_manager: DeviceManager | None = None
     deck: StreamDeck
-    keypress_callbacks: dict[int, Callable]  # Maps key index to callback function
+    keys: list[KeyState]  # Indexed by key index
 
     def __init__(self):
         self.device_manager = DeviceManager()
-        self.keypress_callbacks = {}
-        self.long_press_callbacks = {}
-        self.repeat_long_press_callbacks = {}  # key_index -> (callback, interval)
-        self.long_press_timers = {}
-        self.repeat_long_press_timers = {}
-
-        # Long press tracking
-        self.key_press_times = {}  # Track when keys were pressed
-        self.long_press_timers = {}  # Track active long press timers
-        self.long_press_triggered = {}  # Track if long press was already triggered
-
-        deck = (
-            self.device_manager.enumerate()[0]
-            if self.device_manager.enumerate()
-            else None
-        )
+
+        # Long press and repeat timers of all keys, run by a single thread
+        self.key_timers = KeyTimers()
+
+        # Latest image not yet written for each key, so an image replaced
+        # before the writer thread gets to it is never sent
+        self._pending_key_images: dict[int, KeyImage | Image.Image] = {}
+        self._stop_writing = False
+        self._key_images_changed = threading.Condition()
+
+        # Buttons collected by batch(), per thread
+        self._batch = threading.local()
+
+        # (id(icon), size) -> (icon, resized icon)
+        self.resized_icons: dict[
+            tuple[int, tuple[int, int]], tuple[Image.Image, Image.Image]
+        ] = {}
+
+        # Enumerating rescans the USB bus, so only do it once
+        decks = self.device_manager.enumerate()
+        deck = decks[0] if decks else None
         if deck is None:
             raise RuntimeError("No Stream Deck device found.")
         self.deck = deck
         self.key_count = self.deck.key_count()
+        self.keys = [KeyState() for _ in range(self.key_count)]
+        # Last image written to each key, only used by the writer thread
+        self._written_key_images: list[KeyImage | None] = [None] * self.key_count
         self.key_row_length, self.key_column_length = self.deck.key_layout()
+        # Fixed for a device, so only ask for it once
+        self.key_image_format = self.deck.key_image_format()
+        self.key_size: tuple[int, int] = self.key_image_format["size"]
+        # Identifies the key image format in caches that outlive the process
+        self.key_image_id = repr((self.deck.deck_type(), self.key_image_format))
+        # Closed by close() only. The writer thread and the deck-keyed caches
+        # keep the controller alive, so a finalizer would only run at
+        # interpreter exit, possibly while the writer is still writing.
         self.deck.open()
         self.deck.reset()
 
@@ -54,6 +157,11 @@ class StreamDeckController:
         self.deck.set_key_callback(self.key_pressed)
 
         self.is_connected = True
+        self._close_lock = threading.Lock()
+        self._key_image_writer = threading.Thread(
+            target=self._write_key_images, daemon=True
+        )
+        self._key_image_writer.start()
         logger.info(f"Stream Deck initialized: {self.deck.deck_type()}")
 
     def convert_image(
@@ -65,32 +173,82 @@ class StreamDeckController:
         label: str | None = None,
     ) -> bytes:
         """Convert a PIL Image to the format required by the Stream Deck."""
+        scaled_image = self.scale_image(image, margins=margins, background=background)
+        return self.finalize_image(
+            scaled_image, margins=margins, icon=icon, label=label
+        )
+
+    def scale_image(
+        self,
+        image: Image.Image,
+        margins: tuple[int, int, int, int] = (0, 0, 0, 0),
+        background: str = "black",
+    ) -> Image.Image:
+        """Scale a PIL Image to the key size of the Stream Deck."""
+        # Let JPEG images decode at a reduced scale close to the key size
+        # instead of decoding every pixel only to throw most of them away.
+        # This is a no-op for other formats and already loaded images.
+        image.draft("RGB", self.key_size)
         scaled_image = PILHelper.create_scaled_key_image(
             self.deck, image, margins=margins, background=background
         )
-        if scaled_image.mode != "RGBA":
-            scaled_image = scaled_image.convert("RGBA")
+        # Keys are opaque, keeping RGB saves converting to RGBA and back
+        if scaled_image.mode != "RGB":
+            scaled_image = scaled_image.convert("RGB")
+        return scaled_image
 
-        if icon or label:
-            overlay = Image.new("RGBA", scaled_image.size, (0, 0, 0, 0))
-            draw_overlay = ImageDraw.Draw(overlay)
+    def finalize_image(
+        self,
+        scaled_image: Image.Image,
+        margins: tuple[int, int, int, int] = (0, 0, 0, 0),
+        icon: Image.Image | None = None,
+        label: str | None = None,
+    ) -> bytes:
+        """Add icon and label to a scaled image and convert it for the Stream Deck.
+
+        The scaled image itself is left untouched so it can be shared between
+        several variants.
+        """
+        composed_image = self.compose_image(
+            scaled_image, margins=margins, icon=icon, band=bool(icon or label)
+        )
+        return self.encode_image(composed_image, margins=margins, label=label)
+
+    def compose_image(
+        self,
+        scaled_image: Image.Image,
+        margins: tuple[int, int, int, int] = (0, 0, 0, 0),
+        icon: Image.Image | None = None,
+        band: bool = False,
+    ) -> Image.Image:
+        """Add the translucent band and the icon to a scaled image.
+
+        The result can be shared by several keys that only differ in their label.
+        """
+        # The scaled image is shared, draw on a single copy of it
+        if band or icon:
+            scaled_image = scaled_image.copy()
+
+        if band:
+            # Blend white at half opacity over the lower half
             y_start = int(scaled_image.height * 1 / 2)
-            draw_overlay.rectangle(
-                [(0, y_start), (scaled_image.width, scaled_image.height)],
-                fill=(255, 255, 255, 128),
+            scaled_image.paste(
+                (255, 255, 255),
+                (0, y_start, scaled_image.width, scaled_image.height),
+                label_band((scaled_image.width, scaled_image.height - y_start)),
             )
-            scaled_image = Image.alpha_composite(scaled_image, overlay)
 
         if icon:
             # If an icon is provided, add it to the scaled image
             # Ensure the icon is resized to fit the lower right corner
-            icon = icon.resize(
+            icon = self.resize_icon(
+                icon,
                 (
                     (scaled_image.width - margins[0] - margins[2]) // 3,
                     (scaled_image.height - margins[1] - margins[3]) // 3,
-                )
+                ),
             )
-            scaled_image = add_icon_to_image(
+            add_icon_to_image(
                 scaled_image,
                 icon,
                 position=(
@@ -104,14 +262,20 @@ class StreamDeckController:
                     - 5,  # Adjust for a small margin
                 ),
             )
+        return scaled_image
+
+    def encode_image(
+        self,
+        composed_image: Image.Image,
+        margins: tuple[int, int, int, int] = (0, 0, 0, 0),
+        label: str | None = None,
+    ) -> bytes:
+        """Add a label to a composed image and convert it for the Stream Deck."""
         if label:
-            # If a label is provided, add it to the scaled image
-            draw = ImageDraw.Draw(scaled_image)
-            font = (
-                ImageFont.truetype(str(FONT_PATH), 24)
-                if FONT_PATH.exists()
-                else ImageFont.load_default(24)
-            )
+            # If a label is provided, add it to a copy of the composed image
+            composed_image = composed_image.copy()
+            draw = ImageDraw.Draw(composed_image)
+            font = load_font(24)
 
             # Measure text size
             bbox = draw.textbbox((0, 0), label, font=font)
@@ -120,38 +284,78 @@ class StreamDeckController:
             # Position at lower-left corner
             text_position = (
                 margins[0] + 5,
-                scaled_image.height
+                composed_image.height
                 - margins[3]
                 - text_height
                 - 15,  # Adjust for a small margin
             )
             draw.text(text_position, label, fill="black", font=font)
 
-        # After all drawing (box, icon, label), drop alpha channel –
-        # StreamDeck expects an RGB image
-        if scaled_image.mode == "RGBA":
-            scaled_image = scaled_image.convert("RGB")
+        # StreamDeck expects an RGB image, which scale_image already returns
+        if composed_image.mode != "RGB":
+            composed_image = composed_image.convert("RGB")
 
-        key_image = PILHelper.to_native_format(self.deck, scaled_image)
+        key_image = PILHelper.to_native_format(self.deck, composed_image)
         return key_image
 
-    def set_key_image(self, key_index: int, image: bytes | Image.Image):
-        """Set an image for a specific key on the Stream Deck."""
-        if isinstance(image, Image.Image):
-            # If the image is a PIL Image, convert it to bytes
-            key_image = self.convert_image(image)
-            # If the image is already in bytes format, use it directly
-        else:
-            key_image = image
-
+    def resize_icon(self, icon: Image.Image, size: tuple[int, int]) -> Image.Image:
+        """Resize an icon, reusing the result for later calls with the same size."""
+        cache_key = (id(icon), size)
+        cached = self.resized_icons.get(cache_key)
+        if cached is None:
+            # Keep a reference to the source icon so its id is not reused
+            cached = (icon, icon.resize(size))
+            self.resized_icons[cache_key] = cached
+        return cached[1]
+
+    def set_key_image(self, key_index: int, image: KeyImage | Image.Image) -> None:
+        """Set an image for a specific key on the Stream Deck.
+
+        The image is converted and written by a background thread, so callers
+        don't wait for the USB transfer. Encoded images, including the
+        memoryviews PILHelper.to_native_format returns, are written as is.
+        """
         if 0 <= key_index < self.key_count:
-            self.deck.set_key_image(key_index, key_image)
+            with self._key_images_changed:
+                self._pending_key_images[key_index] = image
+                self._key_images_changed.notify_all()
         else:
             raise IndexError("Key index out of range.")
 
+    def _write_key_images(self) -> None:
+        """Background thread writing pending key images to the Stream Deck."""
+        while True:
+            with self._key_images_changed:
+                self._key_images_changed.wait_for(
+                    lambda: self._pending_key_images or self._stop_writing
+                )
+                if not self._pending_key_images:
+                    return
+                pending, self._pending_key_images = self._pending_key_images, {}
+            # Hold the deck's update lock for the whole batch, so the images
+            # of one update are written back to back
+            with self.deck:
+                for key_index, image in pending.items():
+                    # A bad image must not end the thread, later writes would
+                    # be dropped silently
+                    try:
+                        if isinstance(image, Image.Image):
+                            # If the image is a PIL Image, convert it to bytes
+                            image = self.convert_image(image)
+                        # Skip the USB write if the key already shows this
+                        # image, usually the very same cached object
+                        if image == self._written_key_images[key_index]:
+                            continue
+                        self.deck.set_key_image(key_index, image)
+                        self._written_key_images[key_index] = image
+                    except Exception as e:
+                        logger.error(f"Error writing image of key {key_index}: {e}")
+
     def key_pressed(self, deck: StreamDeck, key: int, state: bool):
         """Handle key press events."""
-        logger.info(f"Key {key} {'pressed' if state else 'released'}.")
+        # Logs run for every key event and button update take lazy %-style
+        # arguments, so nothing is formatted while INFO is off
+        logger.info("Key %d %s.", key, "pressed" if state else "released")
 
         if state:  # Key pressed down
             self._handle_key_press(key)
@@ -160,102 +364,104 @@ class StreamDeckController:
 
     def _handle_key_press(self, key: int):
         """Handle key press down event."""
-        # Record the press time
-        self.key_press_times[key] = time.time()
-        self.long_press_triggered[key] = False
+        key_state = self.keys[key]
+        # Record the press time, a single long press is told apart on release
+        key_state.press_time = time.monotonic()
+        key_state.long_press_triggered = False
 
         # Cancel any existing timer for this key
-        if key in self.long_press_timers:
-            self.long_press_timers[key].cancel()
+        if key_state.long_press_timer:
+            key_state.long_press_timer.cancel()
 
-        # Start a timer for long press detection
-        if key in self.long_press_callbacks or key in self.repeat_long_press_callbacks:
-            timer = threading.Timer(
-                LONG_PRESS_THRESHOLD, self._trigger_long_press, args=[key]
+        # Repeating long presses have to start while the key is still held
+        if key_state.repeat_long_press_callback:
+            key_state.long_press_timer = self.key_timers.call_later(
+                LONG_PRESS_THRESHOLD, self._trigger_long_press, key
             )
-            self.long_press_timers[key] = timer
-            timer.start()
 
     def _handle_key_release(self, key: int):
         """Handle key release event."""
+        key_state = self.keys[key]
         # Cancel the long press timer
-        if key in self.long_press_timers:
-            self.long_press_timers[key].cancel()
-            del self.long_press_timers[key]
+        if key_state.long_press_timer:
+            key_state.long_press_timer.cancel()
+            key_state.long_press_timer = None
 
-        # Cancel repeat long press timers if any
-        if key in self.repeat_long_press_timers:
-            self.repeat_long_press_timers[key].cancel()
-            del self.repeat_long_press_timers[key]
+        # Stop repeating the long press callback if it started
+        if key_state.repeat_stop:
+            key_state.repeat_stop.set()
+            key_state.repeat_stop = None
 
         # Check if this was a long press or regular press
-        if key in self.long_press_triggered and self.long_press_triggered[key]:
+        press_time = key_state.press_time
+        if key_state.long_press_triggered:
             # Long press was already triggered, don't trigger regular press
-            logger.info(f"Long press completed for key {key}")
+            logger.info("Long press completed for key %d", key)
+        elif (
+            key_state.long_press_callback
+            and press_time is not None
+            and time.monotonic() - press_time >= LONG_PRESS_THRESHOLD
+        ):
+            logger.info("Long press triggered for key %d", key)
+            key_state.long_press_callback()
         else:
             # Regular press - trigger the callback
-            if key in self.keypress_callbacks:
-                try:
-                    self.keypress_callbacks[key]()
-                except Exception as e:
-                    logger.error(f"Error in key callback for key {key}: {e}")
+            if key_state.callback:
+                key_state.callback()
 
         # Clean up tracking data
-        self.key_press_times.pop(key, None)
-        self.long_press_triggered.pop(key, None)
+        key_state.press_time = None
+        key_state.long_press_triggered = False
 
     def _trigger_long_press(self, key: int):
-        """Trigger long press callback for a key."""
-        # Handle continuous repeat long press if registered
-        if key in self.repeat_long_press_callbacks:
-            callback, interval = self.repeat_long_press_callbacks[key]
-            self.long_press_triggered[key] = True
-            try:
-                logger.info(f"Continuous long press triggered for key {key}")
-                callback()
-            except Exception as e:
-                logger.error(f"Error in continuous long press for key {key}: {e}")
-            # Schedule next callback
-            timer = threading.Timer(interval, self._repeat_long_press, args=[key])
-            self.repeat_long_press_timers[key] = timer
-            timer.start()
-        # Handle single long press if no repeat registered
-        elif key in self.long_press_callbacks:
-            self.long_press_triggered[key] = True
-            try:
-                logger.info(f"Long press triggered for key {key}")
-                self.long_press_callbacks[key]()
-            except Exception as e:
-                logger.error(f"Error in long press callback for key {key}: {e}")
-
-    def _repeat_long_press(self, key: int):
+        """Start the repeating long press callback of a held key."""
+        key_state = self.keys[key]
+        if key_state.repeat_long_press_callback:
+            key_state.long_press_triggered = True
+            # A flag per hold, so a repeat already running when the key is
+            # released can't schedule another one
+            stop = threading.Event()
+            key_state.repeat_stop = stop
+            if key_state.press_time is None:
+                # Released while this timer was already firing
+                return
+            logger.info("Continuous long press triggered for key %d", key)
+            self._repeat_long_press(key, stop)
+
+    def _repeat_long_press(self, key: int, stop: threading.Event):
         """Internal helper to perform repeated long press callbacks."""
-        if key in self.repeat_long_press_callbacks and self.long_press_triggered.get(
-            key, False
-        ):
-            callback, interval = self.repeat_long_press_callbacks[key]
-            try:
-                callback()
-            except Exception as e:
-                logger.error(f"Error in repeated long press for key {key}: {e}")
-            # Schedule next repetition
-            timer = threading.Timer(interval, self._repeat_long_press, args=[key])
-            self.repeat_long_press_timers[key] = timer
-            timer.start()
+        repeat_long_press_callback = self.keys[key].repeat_long_press_callback
+        if stop.is_set() or not repeat_long_press_callback:
+            return
+        callback, interval = repeat_long_press_callback
+        started = time.monotonic()
+        callback()
+        # Schedule next repetition, counting the time the callback took
+        if not stop.is_set():
+            self.key_timers.call_later(
+                max(0.0, started + interval - time.monotonic()),
+                self._repeat_long_press,
+                key,
+                stop,
+            )
 
     def register_key_callback(self, key_index: int, callback: Callable):
         """Register a callback for a specific key index."""
         if 0 <= key_index < self.key_count:
-            self.keypress_callbacks[key_index] = callback
-            logger.info(f"Callback registered for key {key_index}.")
+            self.keys[key_index].callback = log_errors(
+                callback, f"key callback for key {key_index}"
+            )
+            logger.info("Callback registered for key %d.", key_index)
         else:
             raise IndexError("Key index out of range.")
 
     def register_long_press_callback(self, key_index: int, callback: Callable):
         """Register a long press callback for a specific key index."""
         if 0 <= key_index < self.key_count:
-            self.long_press_callbacks[key_index] = callback
-            logger.info(f"Long press callback registered for key {key_index}.")
+            self.keys[key_index].long_press_callback = log_errors(
+                callback, f"long press callback for key {key_index}"
+            )
+            logger.info("Long press callback registered for key %d.", key_index)
         else:
             raise IndexError("Key index out of range.")
 
@@ -264,46 +470,76 @@ class StreamDeckController:
     ):
         """Register a repeating long press callback for a specific key index with interval in seconds."""
         if 0 <= key_index < self.key_count:
-            self.repeat_long_press_callbacks[key_index] = (callback, interval)
+            self.keys[key_index].repeat_long_press_callback = (
+                log_errors(callback, f"repeated long press for key {key_index}"),
+                interval,
+            )
             logger.info(
-                f"Repeat long press callback registered for key {key_index} every {interval}s."
+                "Repeat long press callback registered for key %d every %ss.",
+                key_index,
+                interval,
             )
         else:
             raise IndexError("Key index out of range.")
 
     def close(self):
-        """Close the Stream Deck connection."""
-        if self.is_connected:
-            # Cancel all active long press timers
-            for timer in self.long_press_timers.values():
-                timer.cancel()
-            self.long_press_timers.clear()
-
-            # Cancel all active repeat long press timers
-            for timer in self.repeat_long_press_timers.values():
-                timer.cancel()
-            self.repeat_long_press_timers.clear()
-
-            self.deck.reset()
-            self.deck.close()
+        """Close the Stream Deck connection, doing nothing if already closed."""
+        # Check and mark as closed together so a concurrent close() returns
+        with self._close_lock:
+            if not self.is_connected:
+                return
             self.is_connected = False
-            logger.info("Stream Deck connection closed.")
-        else:
-            logger.warning("Stream Deck is already disconnected.")
 
-    def __del__(self):
-        """Ensure the Stream Deck is closed when the controller is deleted."""
+        # Cancel all active long press and repeat long press timers
+        for key_state in self.keys:
+            if key_state.long_press_timer:
+                key_state.long_press_timer.cancel()
+                key_state.long_press_timer = None
+            if key_state.repeat_stop:
+                key_state.repeat_stop.set()
+                key_state.repeat_stop = None
+
+        # Let the writer finish the queued images before resetting the keys
+        with self._key_images_changed:
+            self._stop_writing = True
+            self._key_images_changed.notify_all()
+        self._key_image_writer.join(timeout=1)
+        if self._key_image_writer.is_alive():
+            # Resetting or closing the deck under a write would interleave
+            # with it, leave the deck as it is
+            logger.warning("Key image writer did not stop, Stream Deck left open.")
+            return
+
+        self.deck.reset()
+        self.deck.close()
+        logger.info("Stream Deck connection closed.")
+
+    def __enter__(self) -> "StreamDeckController":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
         self.close()
-        logger.info("Stream DeckController instance deleted.")
 
     def set_button(
         self,
         key_index: int,
-        image: bytes | Image.Image | None,
+        image: KeyImage | Image.Image | None,
         action: Callable | None = None,
         long_press_action: Callable | tuple[Callable, float] | None = None,
     ) -> None:
         """Set a button on the Stream Deck."""
+        pending = getattr(self._batch, "pending", None)
+        if pending is not None:
+            # Inside batch(), keep the latest value of each argument for the key
+            button = pending.setdefault(key_index, {"image": None})
+            for name, value in (
+                ("image", image),
+                ("action", action),
+                ("long_press_action", long_press_action),
+            ):
+                if value is not None:
+                    button[name] = value
+            return
         if image is not None:
             self.set_key_image(key_index, image)
         if action is not None:
@@ -315,13 +551,55 @@ class StreamDeckController:
                 self.register_repeat_long_press_callback(key_index, callback, interval)
             elif callable(long_press_action):
                 self.register_long_press_callback(key_index, long_press_action)
-        logger.info(f"Button set: (Key {key_index})")
+        logger.info("Button set: (Key %d)", key_index)
+
+    def set_buttons(self, buttons: dict[int, dict]) -> None:
+        """Set several buttons at once, mapping key index to set_button arguments.
+
+        The key images are queued together, so the writer thread writes them
+        back to back.
+        """
+        for key_index, button in buttons.items():
+            self.set_button(key_index, **button)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Collect the set_button calls made in this thread and apply them on exit.
+
+        Several setup steps can then render all their images first and upload
+        them in one set_buttons call, with each key written at most once.
+        """
+        if getattr(self._batch, "pending", None) is not None:
+            # Already batching, the outermost batch uploads the buttons
+            yield
+            return
+        self._batch.pending = {}
+        try:
+            yield
+        finally:
+            pending, self._batch.pending = self._batch.pending, None
+            self.set_buttons(pending)
+
+
+def log_errors(callback: Callable, description: str) -> Callable[[], None]:
+    """Wrap a key callback so that its exceptions are logged, not raised.
+
+    Done once when the callback is registered, so the key event handlers
+    call it without an exception handler of their own.
+    """
+
+    def wrapper() -> None:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Error in {description}: {e}")
+
+    return wrapper
 
 
 def add_icon_to_image(
     image: Image.Image, icon: Image.Image, position: tuple[int, int]
 ) -> Image.Image:
-    """Add an icon to a base image at the specified position."""
-    image_copy = image.copy()
-    image_copy.paste(icon, position, icon)
-    return image_copy
+    """Add an icon to a base image at the specified position, in place."""
+    image.paste(icon, position, icon)
+    return image
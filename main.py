@@ -20,9 +20,6 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting the pi-stream application")
-    from backend.api import router as api_router
-
-    app.include_router(api_router)
     yield
     logger.info("Cleaning up resources")
     if app_controller:
@@ -36,6 +33,11 @@ app = FastAPI(
     version="1.0.0",
     description="A music streaming application for Raspberry Pi",
 )
+# Imported after get_app_controller() above, so backend.api reuses that
+# controller rather than creating it during the import
+from backend.api import router as api_router  # noqa: E402
+
+app.include_router(api_router)
 
 
 app.add_middleware(